@@ -0,0 +1,79 @@
+"""
+Dynamic batching of concurrent generation requests
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class GenerationBatcher:
+    """Collect requests arriving close together and process them as one batch"""
+    
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10
+    ):
+        # process_batch is blocking and returns one result per item, in order
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _start(self, loop: asyncio.AbstractEventLoop):
+        """Start the batching loop on the given event loop"""
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run())
+    
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._start(loop)
+        
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+    
+    async def stop(self):
+        """Cancel the batching loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _collect(self) -> list:
+        """Wait for one request, then gather any others arriving within max_wait"""
+        batch = [await self._queue.get()]
+        if self.max_batch_size > 1 and self.max_wait > 0:
+            await asyncio.sleep(self.max_wait)
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+    
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            
+            try:
+                results = await asyncio.to_thread(self.process_batch, items)
+            except Exception as e:
+                logger.error(f"Error processing batch of {len(items)}: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
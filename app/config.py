@@ -1,27 +1,54 @@
 import os
-from typing import Dict, List
-from pathlib import Path
+import sys
+import time
+from itertools import chain
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
 from dotenv import load_dotenv
 
-# Load environment variables at startup
-load_dotenv()
+# Seconds a cached file existence check stays valid
+PATH_CHECK_TTL: int = 5
+
+# Files already seen on disk; model files are never removed at runtime
+_known_files: set = set()
+
+@lru_cache(maxsize=32)
+def _file_exists(path: str, bucket: int) -> bool:
+    """Check if a file exists, memoized per time bucket"""
+    return os.path.isfile(path)
+
+def file_exists(path: str) -> bool:
+    """Cached file existence check, re-checked at most every PATH_CHECK_TTL seconds"""
+    if path in _known_files:
+        return True
+    exists = _file_exists(path, int(time.monotonic()) // PATH_CHECK_TTL)
+    if exists:
+        _known_files.add(path)
+    return exists
 
 class Settings:
+    # Values read from the environment live in slots; constants stay on the class
+    __slots__ = (
+        "TOKENIZER_PATH", "WAV_TOKENIZER_CONFIG_PATH", "WAV_TOKENIZER_MODEL_PATH",
+        "MODEL_CONFIG_URL", "MODEL_CHECKPOINT_URL",
+        "PORT", "HOST", "DEBUG",
+        "SAMPLE_RATE", "CHUNK_WORD_LIMIT", "MAX_TEXT_LENGTH", "MAX_AUDIO_FILES",
+        "TEMPERATURE", "REPETITION_PENALTY", "MAX_LENGTH",
+        "BATCH_MAX_SIZE", "BATCH_MAX_WAIT_MS",
+        "TORCH_HOME", "REDUCED_PRECISION", "COMPILE_MODEL",
+        "PREFIX_CACHE", "AUDIO_CACHE", "TEMP_DIR", "LOG_LEVEL",
+        "_all_voices",
+    )
+    
     # API Information
     API_NAME: str = "Nigerian TTS API"
     API_VERSION: str = "1.0.0"
     API_DESCRIPTION: str = "FastAPI-based Text-to-Speech API for Nigerian languages and accents"
     
     # Model configuration
-    TOKENIZER_PATH: str = os.getenv("TOKENIZER_PATH", "saheedniyi/YarnGPT2")
-    WAV_TOKENIZER_CONFIG_PATH: str = os.getenv(
-        "WAV_TOKENIZER_CONFIG_PATH", 
-        "wavtokenizer_mediumdata_frame75_3s_nq1_code4096_dim512_kmeans200_attn.yaml"
-    )
-    WAV_TOKENIZER_MODEL_PATH: str = os.getenv(
-        "WAV_TOKENIZER_MODEL_PATH", 
-        "wavtokenizer_large_speech_320_24k.ckpt"
-    )
+    TOKENIZER_PATH: str
+    WAV_TOKENIZER_CONFIG_PATH: str
+    WAV_TOKENIZER_MODEL_PATH: str
     
     # Model information
     MODEL_SIZE: str = "366M"
@@ -29,14 +56,8 @@ class Settings:
     BASE_MODEL: str = "HuggingFaceTB/SmolLM2-360M"
     
     # Download URLs for model files
-    MODEL_CONFIG_URL: str = os.getenv(
-        "MODEL_CONFIG_URL", 
-        "https://huggingface.co/novateur/WavTokenizer-medium-speech-75token/resolve/main/wavtokenizer_mediumdata_frame75_3s_nq1_code4096_dim512_kmeans200_attn.yaml"
-    )
-    MODEL_CHECKPOINT_URL: str = os.getenv(
-        "MODEL_CHECKPOINT_URL", 
-        "  https://drive.google.com/uc?id=1-ASeEkrn4HY49yZWHTASgfGFNXdVnLTt"
-    )
+    MODEL_CONFIG_URL: str
+    MODEL_CHECKPOINT_URL: str
 
     # CORS settings
     CORS_ORIGINS: list = ["*"]  # Allow all origins by default
@@ -44,21 +65,24 @@ class Settings:
     CORS_HEADERS: list = ["*"]
     
     # Server configuration
-    PORT: int = int(os.getenv("PORT", "8000"))
-    HOST: str = os.getenv("HOST", "0.0.0.0")
-    DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
+    PORT: int
+    HOST: str
+    DEBUG: bool
     
     # Audio settings
-    SAMPLE_RATE: int = int(os.getenv("SAMPLE_RATE", "24000"))  # Documentation specifies 24Khz
+    SAMPLE_RATE: int
     SILENCE_TOKEN: int = 453  # Token used for silence in audio generation
     SILENCE_DURATION: int = 20  # Number of tokens for 0.25s silence
-    CHUNK_WORD_LIMIT: int = int(os.getenv("CHUNK_WORD_LIMIT", "25"))
-    MAX_TEXT_LENGTH: int = int(os.getenv("MAX_TEXT_LENGTH", "1000"))
+    CHUNK_WORD_LIMIT: int
+    MAX_TEXT_LENGTH: int
+    MAX_AUDIO_FILES: int
     
     # TTS Generation settings
-    TEMPERATURE: float = float(os.getenv("TEMPERATURE", "0.1"))
-    REPETITION_PENALTY: float = float(os.getenv("REPETITION_PENALTY", "1.1"))
-    MAX_LENGTH: int = int(os.getenv("MAX_LENGTH", "4000"))
+    TEMPERATURE: float
+    REPETITION_PENALTY: float
+    MAX_LENGTH: int
+    BATCH_MAX_SIZE: int  # Most requests combined into one generate call
+    BATCH_MAX_WAIT_MS: float  # How long to wait for more requests to batch
     DEFAULT_VOICE: str = "idera"  # Documentation mentions idera as default and best voice
     
     # Available voices and languages
@@ -69,25 +93,95 @@ class Settings:
     # To support the documented languages:
     AVAILABLE_LANGUAGES: List[str] = ["english", "yoruba", "igbo", "hausa"]
     
+    # Flat lookups for O(1) request validation
+    # Interned so membership checks can match on identity before comparing characters
+    VALID_VOICES: FrozenSet[str] = frozenset(map(sys.intern, chain.from_iterable(AVAILABLE_VOICES.values())))
+    VALID_LANGUAGES: FrozenSet[str] = frozenset(map(sys.intern, AVAILABLE_LANGUAGES))
+    
     # PyTorch settings
-    TORCH_HOME: str = os.getenv("TORCH_HOME", "/tmp/torch_cache")
+    TORCH_HOME: str
     TORCH_DTYPE: str = "auto"  # As used in documentation
+    REDUCED_PRECISION: bool  # Run in FP16 on GPU / BF16 on AMX CPUs
+    COMPILE_MODEL: bool  # Compile the model forward pass with torch.compile
+    PREFIX_CACHE: bool  # Reuse the KV cache of each voice's prompt prefix
+    AUDIO_CACHE: bool  # Serve repeated (text, language, voice) requests from disk
     
     # File paths
-    TEMP_DIR: str = os.getenv("TEMP_DIR", "/tmp")
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    TEMP_DIR: str
+    LOG_LEVEL: str
+    
+    def __init__(self):
+        # Load environment variables on first use rather than at import
+        load_dotenv()
+        
+        # Model configuration
+        self.TOKENIZER_PATH = os.getenv("TOKENIZER_PATH", "saheedniyi/YarnGPT2")
+        self.WAV_TOKENIZER_CONFIG_PATH = os.getenv(
+            "WAV_TOKENIZER_CONFIG_PATH", 
+            "wavtokenizer_mediumdata_frame75_3s_nq1_code4096_dim512_kmeans200_attn.yaml"
+        )
+        self.WAV_TOKENIZER_MODEL_PATH = os.getenv(
+            "WAV_TOKENIZER_MODEL_PATH", 
+            "wavtokenizer_large_speech_320_24k.ckpt"
+        )
+        
+        # Download URLs for model files
+        self.MODEL_CONFIG_URL = os.getenv(
+            "MODEL_CONFIG_URL", 
+            "https://huggingface.co/novateur/WavTokenizer-medium-speech-75token/resolve/main/wavtokenizer_mediumdata_frame75_3s_nq1_code4096_dim512_kmeans200_attn.yaml"
+        )
+        self.MODEL_CHECKPOINT_URL = os.getenv(
+            "MODEL_CHECKPOINT_URL", 
+            "  https://drive.google.com/uc?id=1-ASeEkrn4HY49yZWHTASgfGFNXdVnLTt"
+        )
+        
+        # Server configuration
+        self.PORT = int(os.getenv("PORT", "8000"))
+        self.HOST = os.getenv("HOST", "0.0.0.0")
+        self.DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+        
+        # Audio settings
+        self.SAMPLE_RATE = int(os.getenv("SAMPLE_RATE", "24000"))  # Documentation specifies 24Khz
+        self.CHUNK_WORD_LIMIT = int(os.getenv("CHUNK_WORD_LIMIT", "25"))
+        self.MAX_TEXT_LENGTH = int(os.getenv("MAX_TEXT_LENGTH", "1000"))
+        self.MAX_AUDIO_FILES = int(os.getenv("MAX_AUDIO_FILES", "200"))
+        
+        # TTS Generation settings
+        self.TEMPERATURE = float(os.getenv("TEMPERATURE", "0.1"))
+        self.REPETITION_PENALTY = float(os.getenv("REPETITION_PENALTY", "1.1"))
+        self.MAX_LENGTH = int(os.getenv("MAX_LENGTH", "4000"))
+        self.BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "8"))
+        self.BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "10"))
+        
+        # PyTorch settings
+        self.TORCH_HOME = os.getenv("TORCH_HOME", "/tmp/torch_cache")
+        self.REDUCED_PRECISION = os.getenv("REDUCED_PRECISION", "true").lower() == "true"
+        self.COMPILE_MODEL = os.getenv("COMPILE_MODEL", "false").lower() == "true"
+        self.PREFIX_CACHE = os.getenv("PREFIX_CACHE", "true").lower() == "true"
+        self.AUDIO_CACHE = os.getenv("AUDIO_CACHE", "true").lower() == "true"
+        
+        # File paths
+        self.TEMP_DIR = os.getenv("TEMP_DIR", "/tmp")
+        self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+        
+        # Ensure required directories exist
+        os.makedirs(self.TEMP_DIR, exist_ok=True)
+        os.makedirs(self.TORCH_HOME, exist_ok=True)
+        
+        # Voice list in display order, built once for error messages
+        self._all_voices = tuple(self.AVAILABLE_VOICES["female"] + self.AVAILABLE_VOICES["male"])
     
     @property
-    def all_voices(self) -> List[str]:
-        """Get all available voices as a flat list"""
-        return self.AVAILABLE_VOICES["female"] + self.AVAILABLE_VOICES["male"]
+    def all_voices(self) -> Tuple[str, ...]:
+        """Get all available voices as a flat tuple"""
+        return self._all_voices
     
     @property
     def model_files_exist(self) -> bool:
         """Check if required model files exist"""
         return (
-            Path(self.WAV_TOKENIZER_CONFIG_PATH).exists() and 
-            Path(self.WAV_TOKENIZER_MODEL_PATH).exists()
+            file_exists(self.WAV_TOKENIZER_CONFIG_PATH) and 
+            file_exists(self.WAV_TOKENIZER_MODEL_PATH)
         )
     
     @property
@@ -100,8 +194,8 @@ class Settings:
         return {
             "config_path": self.WAV_TOKENIZER_CONFIG_PATH,
             "model_path": self.WAV_TOKENIZER_MODEL_PATH,
-            "config_exists": Path(self.WAV_TOKENIZER_CONFIG_PATH).exists(),
-            "model_exists": Path(self.WAV_TOKENIZER_MODEL_PATH).exists(),
+            "config_exists": file_exists(self.WAV_TOKENIZER_CONFIG_PATH),
+            "model_exists": file_exists(self.WAV_TOKENIZER_MODEL_PATH),
             "config_url": self.MODEL_CONFIG_URL,
             "model_url": self.MODEL_CHECKPOINT_URL,
             "model_size": self.MODEL_SIZE,
@@ -109,9 +203,18 @@ class Settings:
             "base_model": self.BASE_MODEL
         }
 
-# Create global settings instance
-settings = Settings()
+# Global settings instance, created on first access
+_settings = None
+
+def get_settings() -> Settings:
+    """Get the global settings instance, creating it if needed"""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
 
-# Ensure required directories exist
-Path(settings.TEMP_DIR).mkdir(parents=True, exist_ok=True)
-Path(settings.TORCH_HOME).mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+def __getattr__(name: str):
+    # Build settings lazily so `from app.config import settings` keeps working
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,7 +3,7 @@
 Data models for Nigerian TTS API
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict
 from datetime import datetime
 
@@ -12,20 +12,20 @@ class TTSRequest(BaseModel):
     text: str = Field(..., description="Text to convert to speech", min_length=1, max_length=1000)
     voice: str = Field(..., description="Voice to use (idera, adunni, kemi, seun, emeka, chidi)")
     language: str = Field("english", description="Language (english, yoruba, igbo, hausa, pidgin)")
+    return_base64: bool = Field(True, description="Include base64 audio in the response; if false, fetch audio_url instead")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "text": "Welcome to Nigerian TTS API",
-                "voice": "idera",
-                "language": "english"
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "text": "Welcome to Nigerian TTS API",
+            "voice": "idera",
+            "language": "english"
         }
+    })
 
 class TTSResponse(BaseModel):
     """Response model for TTS generation"""
-    audio_base64: str = Field(..., description="Base64 encoded audio data")
-    audio_url: str = Field(..., description="URL to download the audio file")
+    audio_base64: str = Field(..., description="Base64 encoded audio data, empty if return_base64 was false")
+    audio_url: str = Field(..., description="URL to download the audio file, kept until newer files evict it")
     text: str = Field(..., description="Original text that was converted")
     voice: str = Field(..., description="Voice used for generation")
     language: str = Field(..., description="Language used for generation")
@@ -33,19 +33,18 @@ class TTSResponse(BaseModel):
     generated_at: datetime = Field(..., description="When the audio was generated")
     testing_mode: bool = Field(default=False, description="Whether this was generated in testing mode")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "audio_base64": "UklGRiQAAABXQVZFZm10IBAA...",
-                "audio_url": "/audio/audio_123456.wav",
-                "text": "Welcome to Nigerian TTS API",
-                "voice": "idera",
-                "language": "english",
-                "duration": 2.5,
-                "generated_at": "2024-01-01T12:00:00",
-                "testing_mode": False
-            }
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "audio_base64": "UklGRiQAAABXQVZFZm10IBAA...",
+            "audio_url": "/audio/audio_123456.wav",
+            "text": "Welcome to Nigerian TTS API",
+            "voice": "idera",
+            "language": "english",
+            "duration": 2.5,
+            "generated_at": "2024-01-01T12:00:00",
+            "testing_mode": False
         }
+    })
 
 class HealthResponse(BaseModel):
     """Health check response"""
@@ -81,11 +80,10 @@ class ErrorResponse(BaseModel):
     status_code: int = Field(..., description="HTTP status code")
     timestamp: str = Field(..., description="Error timestamp")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "detail": "Text is too long. Maximum length is 1000 characters",
-                "status_code": 400,
-                "timestamp": "2024-01-01T12:00:00"
-            }
-        }
\ No newline at end of file
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "detail": "Text is too long. Maximum length is 1000 characters",
+            "status_code": 400,
+            "timestamp": "2024-01-01T12:00:00"
+        }
+    })
\ No newline at end of file
@@ -1,98 +1,206 @@
 import os
-import uuid
+import re
+import stat
+import time
+import base64
+import hashlib
+import threading
 import tempfile
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Tuple
+import platform
+import psutil
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import datetime
+from typing import Callable, Optional, Sequence, Tuple
 from pathlib import Path
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application entry point
 logger = logging.getLogger(__name__)
 
+# Characters rejected in TTS input text
+_INVALID_CHARS = re.compile(r'[<>{}]')
+
+# Filename characters replaced by sanitize_filename
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '/\\:*?"<>|'})
+
+# Audio file extensions the cleanup helpers manage
+_AUDIO_EXTS = ('.wav', '.mp3', '.flac')
+
+# Below this many stale files, deleting serially beats starting a thread pool
+_PARALLEL_DELETE_MIN = 8
+
+# Platform details don't change while the process runs
+_PLATFORM = platform.system()
+_PYTHON_VERSION = platform.python_version()
+
 def get_temp_audio_dir() -> str:
     """Get or create temporary audio directory"""
     temp_dir = tempfile.mkdtemp(prefix="tts_audio_")
-    logger.info(f"Created temporary audio directory: {temp_dir}")
+    logger.info("Created temporary audio directory: %s", temp_dir)
     return temp_dir
 
 def generate_audio_filename(extension: str = "wav") -> Tuple[str, str]:
     """Generate unique audio filename and full path"""
-    audio_id = str(uuid.uuid4())
+    # 96 random bits, URL-safe and shorter than a UUID string
+    audio_id = base64.urlsafe_b64encode(os.urandom(12)).rstrip(b'=').decode('ascii')
     filename = f"{audio_id}.{extension}"
     return audio_id, filename
 
-def cleanup_old_files(directory: str, max_age_hours: int = 1) -> int:
+def cleanup_old_files(
+    directory: str,
+    max_age_hours: int = 1,
+    extensions: Tuple[str, ...] = _AUDIO_EXTS
+) -> int:
     """Clean up old files and return count of deleted files"""
     deleted_count = 0
     
-    if not os.path.exists(directory):
-        logger.warning(f"Directory does not exist: {directory}")
+    # One stat call rules out both missing paths and non-directories
+    try:
+        is_dir = stat.S_ISDIR(os.stat(directory).st_mode)
+    except OSError:
+        is_dir = False
+    if not is_dir:
+        logger.warning("Directory does not exist: %s", directory)
         return deleted_count
     
-    cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
+    cutoff_time = time.time() - max_age_hours * 3600
     
+    stale = []
     try:
-        for filename in os.listdir(directory):
-            if not filename.endswith(('.wav', '.mp3', '.flac')):
-                continue
+        # scandir entries carry cached stat info, saving a syscall per file
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(extensions):
+                    continue
                 
-            file_path = os.path.join(directory, filename)
-            
-            try:
-                file_mod_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-                
-                if file_mod_time < cutoff_time:
-                    os.remove(file_path)
-                    deleted_count += 1
-                    logger.info(f"Deleted old audio file: {filename}")
-                    
-            except (OSError, IOError) as e:
-                logger.error(f"Error processing file {filename}: {e}")
-                continue
+                try:
+                    if entry.stat().st_mtime < cutoff_time:
+                        stale.append(entry.path)
+                except (OSError, IOError) as e:
+                    logger.error("Error processing file %s: %s", entry.name, e)
+                    continue
                 
     except Exception as e:
-        logger.error(f"Error during cleanup in {directory}: {e}")
+        logger.error("Error during cleanup in %s: %s", directory, e)
+    
+    # Overlap the unlink syscalls when many files expire at once
+    if len(stale) < _PARALLEL_DELETE_MIN:
+        deleted_count = sum(map(_remove_file, stale))
+    else:
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as executor:
+            deleted_count = sum(executor.map(_remove_file, stale))
     
     if deleted_count > 0:
-        logger.info(f"Cleanup complete: deleted {deleted_count} files from {directory}")
+        logger.info("Cleanup complete: deleted %s files from %s", deleted_count, directory)
     
     return deleted_count
 
+def _remove_file(file_path: str) -> bool:
+    """Delete an old audio file, logging instead of raising on failure"""
+    try:
+        os.remove(file_path)
+    except OSError as e:
+        logger.error("Error deleting file %s: %s", os.path.basename(file_path), e)
+        return False
+    
+    logger.info("Deleted old audio file: %s", os.path.basename(file_path))
+    return True
+
+def save_audio_file(file_path: str, audio_bytes: bytes) -> bool:
+    """Write audio bytes to a file"""
+    try:
+        with open(file_path, "wb") as f:
+            f.write(audio_bytes)
+        return True
+    except OSError as e:
+        logger.error("Error saving audio file %s: %s", file_path, e)
+        return False
+
+def read_audio_file(file_path: str) -> Optional[bytes]:
+    """Read audio bytes from a file, or None if it can't be read"""
+    try:
+        with open(file_path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def audio_cache_key(text: str, language: str, voice: str) -> str:
+    """Hash a TTS request into a cache key, ignoring whitespace differences in the text"""
+    normalized = f"{' '.join(text.split())}|{voice}|{language}"
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
 def cleanup_single_file(file_path: str) -> bool:
     """Delete a specific file safely"""
     try:
         if os.path.exists(file_path):
             os.remove(file_path)
-            logger.info(f"Cleaned up file: {file_path}")
+            logger.info("Cleaned up file: %s", file_path)
             return True
         return False
     except Exception as e:
-        logger.error(f"Error cleaning up file {file_path}: {e}")
+        logger.error("Error cleaning up file %s: %s", file_path, e)
         return False
 
+def validate_text_length(text: str, max_length: int = 1000) -> bool:
+    """Check that text is non-blank and within the length limit"""
+    # len is O(1), so empty and oversized text is rejected before any scanning
+    length = len(text)
+    if length == 0 or length > max_length:
+        return False
+    
+    # isspace scans in C and stops at the first visible character, without copying
+    return not text.isspace()
+
+# Clients often resend the same text, so results are cached
+@lru_cache(maxsize=1024)
 def validate_text_input(text: str, max_length: int = 1000) -> Tuple[bool, str]:
     """Validate text input for TTS generation"""
-    if not text or not text.strip():
+    stripped = text.strip() if text else ""
+    if not stripped:
         return False, "Text cannot be empty"
     
-    if len(text.strip()) > max_length:
+    if len(stripped) > max_length:
         return False, f"Text too long. Maximum length is {max_length} characters"
     
     # Check for potentially problematic characters
-    if any(char in text for char in ['<', '>', '{', '}']):
+    if _INVALID_CHARS.search(text):
         return False, "Text contains invalid characters"
     
     return True, "Valid"
 
+@lru_cache(maxsize=8)
+def make_duration_estimator(words_per_minute: int = 150) -> Callable[[str], float]:
+    """Build a duration estimator with the speaking rate baked in"""
+    seconds_per_word = 60.0 / words_per_minute
+    
+    def estimate(text: str) -> float:
+        stripped = text.strip()
+        if not stripped:
+            return 0.0
+        
+        # Counting spaces approximates the word count without building a list
+        return round((stripped.count(' ') + 1) * seconds_per_word, 2)
+    
+    return estimate
+
+DEFAULT_DURATION_ESTIMATOR = make_duration_estimator(150)
+
 def estimate_audio_duration(text: str, words_per_minute: int = 150) -> float:
     """Estimate audio duration in seconds based on text length"""
-    word_count = len(text.split())
-    if word_count == 0:
-        return 0.0
-    
-    duration_minutes = word_count / words_per_minute
-    return round(duration_minutes * 60, 2)
+    return make_duration_estimator(words_per_minute)(text)
+
+def estimate_audio_duration_batch(texts: Sequence[str], words_per_minute: int = 150) -> np.ndarray:
+    """Estimate audio durations in seconds for many texts at once"""
+    stripped = [text.strip() for text in texts]
+    word_counts = np.fromiter(
+        (text.count(' ') + 1 if text else 0 for text in stripped),
+        dtype=np.int64,
+        count=len(stripped)
+    )
+    return np.round(word_counts * (60.0 / words_per_minute), 2)
 
 def get_file_size_mb(file_path: str) -> float:
     """Get file size in megabytes"""
@@ -108,38 +216,42 @@ def ensure_directory_exists(directory: str) -> bool:
         os.makedirs(directory, exist_ok=True)
         return True
     except Exception as e:
-        logger.error(f"Error creating directory {directory}: {e}")
+        logger.error("Error creating directory %s: %s", directory, e)
         return False
 
 def get_system_info() -> dict:
     """Get basic system information for health checks"""
-    import psutil
-    import platform
-    
     try:
         return {
-            "platform": platform.system(),
-            "python_version": platform.python_version(),
-            "cpu_percent": psutil.cpu_percent(),
+            "platform": _PLATFORM,
+            "python_version": _PYTHON_VERSION,
+            "cpu_percent": psutil.cpu_percent(interval=None),
             "memory_percent": psutil.virtual_memory().percent,
             "disk_usage": psutil.disk_usage('/').percent
         }
     except Exception as e:
-        logger.error(f"Error getting system info: {e}")
+        logger.error("Error getting system info: %s", e)
         return {"error": str(e)}
 
+# Last formatted "now" timestamp as (100 ms bucket, iso string)
+_last_timestamp: Tuple[int, str] = (0, "")
+
 def format_timestamp(dt: datetime = None) -> str:
     """Format timestamp for API responses"""
-    if dt is None:
-        dt = datetime.now()
-    return dt.isoformat()
+    global _last_timestamp
+    if dt is not None:
+        return dt.isoformat()
+    
+    # Reuse the formatted current time within the same 100 ms window
+    bucket = int(time.time() * 10)
+    if _last_timestamp[0] != bucket:
+        _last_timestamp = (bucket, datetime.now().isoformat())
+    return _last_timestamp[1]
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe file operations"""
-    # Remove or replace unsafe characters
-    unsafe_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
-    for char in unsafe_chars:
-        filename = filename.replace(char, '_')
+    # Replace unsafe characters in a single pass
+    filename = filename.translate(_SANITIZE_TABLE)
     
     # Limit length
     if len(filename) > 100:
@@ -151,19 +263,96 @@ def sanitize_filename(filename: str) -> str:
 class AudioFileManager:
     """Manage temporary audio files"""
     
-    def __init__(self, base_dir: str = None):
+    __slots__ = ('base_dir', 'cache_dir', 'max_files', '_recent', '_cached')
+    
+    def __init__(self, base_dir: str = None, max_files: int = 200):
         self.base_dir = base_dir or tempfile.mkdtemp(prefix="tts_")
+        self.max_files = max_files
+        # Paths handed out so far, oldest first; the oldest is deleted once over max_files
+        self._recent = OrderedDict()
+        # Generated audio reused across identical requests, least recently used first
+        self.cache_dir = os.path.join(self.base_dir, "cache")
+        self._cached = OrderedDict()
         ensure_directory_exists(self.base_dir)
+        ensure_directory_exists(self.cache_dir)
         
     def create_audio_path(self, extension: str = "wav") -> Tuple[str, str]:
         """Create a new audio file path"""
         audio_id, filename = generate_audio_filename(extension)
         file_path = os.path.join(self.base_dir, filename)
+        self._track(file_path)
         return audio_id, file_path
     
+    def _track(self, file_path: str):
+        """Remember a new file and delete the oldest ones beyond max_files"""
+        self._recent[file_path] = None
+        while len(self._recent) > self.max_files:
+            oldest, _ = self._recent.popitem(last=False)
+            try:
+                os.remove(oldest)
+            except FileNotFoundError:
+                # Already removed after its response was sent
+                pass
+            except OSError as e:
+                logger.error("Error deleting file %s: %s", oldest, e)
+    
+    def get_or_create(self, key: str) -> Tuple[str, bool]:
+        """Get the cache path for a key and whether audio is already stored there"""
+        path = os.path.join(self.cache_dir, f"{key}.wav")
+        hit = path in self._cached
+        if hit:
+            self._cached.move_to_end(path)
+        return path, hit
+    
+    def store_cached(self, path: str, audio_bytes: bytes) -> bool:
+        """Atomically write audio into the cache (blocking)"""
+        # A unique temporary name keeps concurrent writers of the same key apart
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        if not save_audio_file(tmp_path, audio_bytes):
+            return False
+        try:
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.error("Error caching audio file %s: %s", path, e)
+            return False
+    
+    def remember_cached(self, path: str):
+        """Record a stored cache file and delete the least recently used beyond max_files"""
+        self._cached[path] = None
+        self._cached.move_to_end(path)
+        while len(self._cached) > self.max_files:
+            oldest, _ = self._cached.popitem(last=False)
+            try:
+                os.remove(oldest)
+            except OSError as e:
+                logger.error("Error deleting cached file %s: %s", oldest, e)
+    
     def cleanup_all(self) -> int:
         """Clean up all files in the managed directory"""
-        return cleanup_old_files(self.base_dir, max_age_hours=0)
+        return self._purge()
+    
+    def _purge(self) -> int:
+        """Delete every audio file in the managed directory without age checks"""
+        deleted_count = 0
+        self._recent.clear()
+        try:
+            with os.scandir(self.base_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(_AUDIO_EXTS):
+                        continue
+                    try:
+                        os.remove(entry.path)
+                        deleted_count += 1
+                    except OSError as e:
+                        logger.error("Error deleting file %s: %s", entry.name, e)
+        except OSError as e:
+            logger.error("Error during cleanup in %s: %s", self.base_dir, e)
+        
+        if deleted_count > 0:
+            logger.info("Purged %s files from %s", deleted_count, self.base_dir)
+        
+        return deleted_count
     
     def cleanup_old(self, max_age_hours: int = 1) -> int:
         """Clean up old files"""
@@ -172,7 +361,7 @@ class AudioFileManager:
     def get_file_count(self) -> int:
         """Get count of files in managed directory"""
         try:
-            return len([f for f in os.listdir(self.base_dir) 
-                       if f.endswith(('.wav', '.mp3', '.flac'))])
+            with os.scandir(self.base_dir) as entries:
+                return sum(1 for e in entries if e.name.endswith(_AUDIO_EXTS))
         except:
             return 0
\ No newline at end of file
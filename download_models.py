@@ -4,31 +4,112 @@ Use this if you're hosting model files externally
 """
 
 import os
+import shutil
 import requests
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-# Add gdown import
-try:
-    import gdown
-except ImportError:
-    gdown = None
-    print("gdown is not installed. Google Drive downloads will not work.")
+CONFIG_FILENAME = "wavtokenizer_mediumdata_frame75_3s_nq1_code4096_dim512_kmeans200_attn.yaml"
+MODEL_FILENAME = "wavtokenizer_large_speech_320_24k.ckpt"
+
+# (connect, read) timeouts in seconds; the read timeout applies per block, not the whole file
+DOWNLOAD_TIMEOUT = (10, 60)
+
+def file_downloaded(filename):
+    """Check if a non-empty copy of the file is already on disk"""
+    return os.path.isfile(filename) and os.path.getsize(filename) > 0
+
+def etag_path(filename):
+    """Path of the marker file recording the ETag of a download"""
+    return f"{filename}.etag"
+
+def get_remote_info(url):
+    """Get (size, etag) of a remote file with a HEAD request"""
+    try:
+        response = requests.head(url, allow_redirects=True, timeout=10)
+        response.raise_for_status()
+        size = int(response.headers.get("Content-Length", 0))
+        return size, response.headers.get("ETag", "")
+    except (requests.RequestException, ValueError) as e:
+        print(f"Could not check {url}: {e}")
+        return 0, ""
+
+def write_etag(filename, etag):
+    """Record the ETag next to a downloaded file"""
+    with open(etag_path(filename), "w") as f:
+        f.write(etag)
+
+def read_etag(filename):
+    """Read the ETag recorded for a downloaded file, or an empty string"""
+    try:
+        with open(etag_path(filename)) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+def is_up_to_date(url, filename):
+    """Check if the local file matches the remote one and can be skipped"""
+    if not file_downloaded(filename):
+        return False
+    
+    # Trust a previous download without any network round-trip
+    if os.getenv("MODEL_SKIP_CHECK") == "1" and os.path.exists(etag_path(filename)):
+        return True
+    
+    # A HEAD on a Drive link describes the HTML interstitial page, not the file,
+    # so trust any completed download (marked by its .etag file)
+    if "drive.google.com" in url:
+        return os.path.exists(etag_path(filename))
+    
+    remote_size, etag = get_remote_info(url)
+    stored_etag = read_etag(filename)
+    if etag and stored_etag:
+        # The ETag changes when the file is replaced, even at the same size
+        return etag == stored_etag
+    
+    if remote_size and remote_size == os.path.getsize(filename):
+        write_etag(filename, etag)
+        return True
+    return False
 
 def download_file(url, filename):
-    """Download a file from URL or Google Drive"""
+    """Download a file from URL or Google Drive, returning its ETag if known"""
+    # Write to a temporary name so an interrupted download never looks complete
+    part_path = f"{filename}.part"
+    etag = ""
     if "drive.google.com" in url:
-        if gdown is None:
+        # gdown is only needed for Google Drive links, so import it on demand
+        try:
+            import gdown
+        except ImportError:
             raise ImportError("gdown is required for Google Drive downloads. Please install it.")
         print(f"Downloading {filename} from Google Drive with gdown...")
-        gdown.download(url, filename, quiet=False)
+        if gdown.download(url, part_path, quiet=False) is None:
+            raise RuntimeError(f"gdown could not download {url}")
     else:
         print(f"Downloading {filename} from {url} with requests...")
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        with open(filename, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        with requests.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            etag = response.headers.get("ETag", "")
+            with open(part_path, 'wb') as f:
+                # Copy in 1 MiB blocks instead of looping over small chunks
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+    os.replace(part_path, filename)
     print(f"Downloaded {filename} successfully!")
+    return etag
+
+def fetch_model_file(url, filename):
+    """Download a model file unless an up-to-date copy already exists"""
+    if is_up_to_date(url, filename):
+        print(f"{filename} already present, skipping")
+        return
+    
+    # Drop the marker first so a failed download isn't trusted on the next run
+    try:
+        os.remove(etag_path(filename))
+    except FileNotFoundError:
+        pass
+    write_etag(filename, download_file(url, filename))
 
 def main():
     """Download required model files"""
@@ -39,16 +120,14 @@ def main():
         print("MODEL_CONFIG_URL and MODEL_CHECKPOINT_URL environment variables must be set")
         return False
     try:
-        # Download config file
-        download_file(
-            config_url, 
-            "wavtokenizer_mediumdata_frame75_3s_nq1_code4096_dim512_kmeans200_attn.yaml"
-        )
-        # Download model file
-        download_file(
-            model_url,
-            "wavtokenizer_large_speech_320_24k.ckpt"
-        )
+        # The two files are independent, so download them in parallel
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(fetch_model_file, config_url, CONFIG_FILENAME),
+                executor.submit(fetch_model_file, model_url, MODEL_FILENAME)
+            ]
+            for future in futures:
+                future.result()
         print("All model files downloaded successfully!")
         return True
     except Exception as e:
@@ -1,16 +1,33 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import asyncio
+import logging
+import psutil
 import torch
 import torchaudio
-import base64
-from transformers import AutoModelForCausalLM
+from transformers import AutoModelForCausalLM, LogitsProcessor, LogitsProcessorList
 from datetime import datetime
 import tempfile
 import numpy as np
 import io
 import wave
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# pybase64 uses SIMD kernels and is API-compatible with the stdlib module
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# Intel Extension for PyTorch provides AMX BF16 kernels on recent Xeons
+try:
+    import intel_extension_for_pytorch as ipex
+except ImportError:
+    ipex = None
 
 # Try to import YarnGPT, fall back to None if not available
 try:
@@ -26,19 +43,25 @@ except ImportError as e:
 # Import from your other files
 from app.config import settings
 from app.models import TTSRequest, TTSResponse, HealthResponse, VoicesResponse, LanguagesResponse, APIInfoResponse
+from app.batching import GenerationBatcher
 from app.utils import (
     AudioFileManager, 
+    generate_audio_filename,
     validate_text_input, 
-    estimate_audio_duration,
+    DEFAULT_DURATION_ESTIMATOR,
     get_system_info,
-    cleanup_old_files
+    format_timestamp,
+    save_audio_file,
+    read_audio_file,
+    audio_cache_key
 )
 
 # Initialize FastAPI with settings from config
 app = FastAPI(
     title=settings.API_NAME,
     version=settings.API_VERSION,
-    description=settings.API_DESCRIPTION
+    description=settings.API_DESCRIPTION,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware using config
@@ -53,26 +76,50 @@ app.add_middleware(
 # Global variables for model
 audio_tokenizer = None
 model = None
+model_dtype = None  # Reduced precision the model runs in, if any
 
 # Initialize file manager
-audio_manager = AudioFileManager()
+audio_manager = AudioFileManager(max_files=settings.MAX_AUDIO_FILES)
 
 # Testing mode check - True if YarnGPT not available OR explicitly set
 TESTING_MODE = not YARNGPT_AVAILABLE or os.getenv("TESTING_MODE", "false").lower() == "true"
 
+# Voices and languages never change at runtime, so serialize them once
+VOICES_JSON = VoicesResponse(
+    female=settings.AVAILABLE_VOICES["female"],
+    male=settings.AVAILABLE_VOICES["male"]
+).model_dump_json().encode()
+LANGUAGES_JSON = LanguagesResponse(languages=settings.AVAILABLE_LANGUAGES).model_dump_json().encode()
+
+# Connect and read timeouts for model downloads, in seconds
+DOWNLOAD_TIMEOUT = (10, 60)
+
+@lru_cache(maxsize=1)
+def get_download_session():
+    """Shared HTTP session so model downloads reuse connections"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 async def download_model_if_needed():
     """Download model files if they don't exist and URLs are provided"""
     if not settings.can_download_models:
         print("No model download URLs provided")
         return False
     
-    import requests
+    session = get_download_session()
     
     # Download config file
     if not os.path.exists(settings.WAV_TOKENIZER_CONFIG_PATH):
         print("Downloading config file...")
         try:
-            response = requests.get(settings.MODEL_CONFIG_URL)
+            # The config is small, so fetch it in one shot
+            response = session.get(settings.MODEL_CONFIG_URL, timeout=DOWNLOAD_TIMEOUT)
             response.raise_for_status()
             with open(settings.WAV_TOKENIZER_CONFIG_PATH, 'wb') as f:
                 f.write(response.content)
@@ -85,11 +132,11 @@ async def download_model_if_needed():
     if not os.path.exists(settings.WAV_TOKENIZER_MODEL_PATH):
         print("Downloading model file...")
         try:
-            response = requests.get(settings.MODEL_CHECKPOINT_URL, stream=True)
-            response.raise_for_status()
-            with open(settings.WAV_TOKENIZER_MODEL_PATH, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            with session.get(settings.MODEL_CHECKPOINT_URL, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
+                with open(settings.WAV_TOKENIZER_MODEL_PATH, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=1 << 20):
+                        f.write(chunk)
             print("Model file downloaded!")
         except Exception as e:
             print(f"Error downloading model: {e}")
@@ -97,9 +144,47 @@ async def download_model_if_needed():
     
     return True
 
+def cpu_supports_amx_bf16() -> bool:
+    """Check if the CPU has AMX BF16 units (Xeon Sapphire Rapids and later)"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            return "amx_bf16" in f.read()
+    except OSError:
+        return False
+
+def get_reduced_precision_dtype(device: torch.device):
+    """Pick the reduced precision dtype for the device, or None to keep the checkpoint's"""
+    if not settings.REDUCED_PRECISION:
+        return None
+    if device.type == "cuda":
+        return torch.float16
+    if device.type == "cpu" and cpu_supports_amx_bf16():
+        return torch.bfloat16
+    return None
+
+def configure_cpu_threads():
+    """Tune PyTorch threading for CPU inference"""
+    # One intra-op thread per physical core; hyperthreads share the same matmul units
+    torch.set_num_threads(psutil.cpu_count(logical=False) or os.cpu_count())
+    try:
+        # Generation runs one op at a time, so inter-op threads only add contention
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # The inter-op pool has already started and can no longer be resized
+        pass
+
+def warm_up_model():
+    """Run a short generation so the first request doesn't pay compile latency"""
+    print("Warming up compiled model...")
+    input_ids = audio_tokenizer.tokenizer.encode(
+        "warm up", add_special_tokens=False, return_tensors="pt"
+    ).to(audio_tokenizer.device)
+    with torch.inference_mode():
+        model.generate(input_ids=input_ids, attention_mask=torch.ones_like(input_ids), max_new_tokens=8)
+
 async def load_models():
     """Load models on startup"""
-    global audio_tokenizer, model
+    global audio_tokenizer, model, model_dtype
     
     if TESTING_MODE:
         print("🧪 Running in TESTING mode - no real models loaded")
@@ -115,6 +200,9 @@ async def load_models():
                 print("❌ Failed to download models")
                 return False
         
+        if not torch.cuda.is_available():
+            configure_cpu_threads()
+        
         # Load the models
         audio_tokenizer = AudioTokenizerV2(
             settings.TOKENIZER_PATH, 
@@ -125,6 +213,26 @@ async def load_models():
             settings.TOKENIZER_PATH, 
             torch_dtype="auto"
         ).to(audio_tokenizer.device)
+        model.eval()
+        
+        # Let any remaining FP32 matmuls use TF32 Tensor Cores on Ampere and newer GPUs
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        
+        # FP16 uses Tensor Cores on GPU, BF16 uses AMX on recent Xeons
+        model_dtype = get_reduced_precision_dtype(audio_tokenizer.device)
+        if model_dtype is not None:
+            model = model.to(model_dtype)
+            print(f"Running model in {model_dtype}")
+        
+        if ipex is not None and model_dtype == torch.bfloat16:
+            model = ipex.optimize(model, dtype=torch.bfloat16)
+        
+        if settings.COMPILE_MODEL:
+            # Compile the forward pass that generate() calls for every token. The default
+            # mode suits CPU too; CUDA graphs ("reduce-overhead") would re-record per shape
+            model.forward = torch.compile(model.forward, dynamic=True)
+            await asyncio.to_thread(warm_up_model)
         
         print("✅ Models loaded successfully!")
         return True
@@ -134,20 +242,21 @@ async def load_models():
         print("🧪 Falling back to TESTING mode")
         return False
 
+@lru_cache(maxsize=1)
 def create_mock_audio() -> bytes:
-    """Create mock audio for testing mode"""
+    """Create mock audio for testing mode, built once and cached"""
     # Create a simple sine wave as mock audio
     # Generate 2 seconds of sine wave
     sample_rate = getattr(settings, 'SAMPLE_RATE', 24000)
     duration = 2.0
     frequency = 440  # A4 note
     
-    # Generate sine wave
-    t = np.linspace(0, duration, int(sample_rate * duration))
-    audio_data = np.sin(2 * np.pi * frequency * t) * 0.3
-    
-    # Convert to 16-bit PCM
-    audio_data = (audio_data * 32767).astype(np.int16)
+    # Generate sine wave directly as 16-bit PCM, in float32 to halve memory traffic
+    num_samples = int(sample_rate * duration)
+    step = np.float32(2 * np.pi * frequency / sample_rate)
+    phase = np.arange(num_samples, dtype=np.float32)
+    phase *= step
+    audio_data = (np.sin(phase, out=phase) * np.float32(0.3 * 32767)).astype(np.int16)
     
     # Create WAV file in memory
     buffer = io.BytesIO()
@@ -160,9 +269,146 @@ def create_mock_audio() -> bytes:
     buffer.seek(0)
     return buffer.read()
 
+@lru_cache(maxsize=1)
+def create_mock_audio_base64() -> str:
+    """Base64-encoded mock audio, encoded once and cached"""
+    return base64.b64encode(create_mock_audio()).decode('utf-8')
+
+def encode_wav(audio: torch.Tensor) -> bytes:
+    """Encode an audio tensor as WAV bytes in memory"""
+    buffer = io.BytesIO()
+    torchaudio.save(buffer, audio, sample_rate=settings.SAMPLE_RATE, format="wav")
+    return buffer.getvalue()
+
+@contextmanager
+def inference_context():
+    """Disable autograd and autocast to the model's reduced precision dtype, if any"""
+    with torch.inference_mode(), torch.autocast(
+        device_type=audio_tokenizer.device.type, dtype=model_dtype, enabled=model_dtype is not None
+    ):
+        yield
+
+@lru_cache(maxsize=1024)
+def encode_prompt(text: str, language: str, voice: str) -> Tuple[int, ...]:
+    """Build and tokenize the prompt for a request, cached for repeated texts"""
+    # Tokenize directly rather than via tokenize_prompt, which keeps per-call state
+    return tuple(audio_tokenizer.tokenizer.encode(
+        audio_tokenizer.create_prompt(text, lang=language, speaker_name=voice),
+        add_special_tokens=False
+    ))
+
+# Prompt prefix KV caches by (language, voice): (prefix token ids, past_key_values)
+prefix_cache: Dict[Tuple[str, str], Tuple[Tuple[int, ...], tuple]] = {}
+
+def get_prompt_prefix(language: str, voice: str) -> Tuple[Tuple[int, ...], tuple]:
+    """Get the tokens and KV cache for the part of the prompt before the user's text"""
+    key = (language, voice)
+    if key not in prefix_cache:
+        # Prompts start with the speaker's reference words, then the user's words
+        special_tokens = audio_tokenizer.special_tokens
+        speaker_prompt = audio_tokenizer.create_prompt("", lang=language, speaker_name=voice)
+        prefix_text = speaker_prompt[:speaker_prompt.index(special_tokens["text_end"])] + special_tokens["text_sep"]
+        prefix_ids = tuple(audio_tokenizer.tokenizer.encode(prefix_text, add_special_tokens=False))
+        
+        with inference_context():
+            past_key_values = model(
+                torch.tensor([prefix_ids], device=audio_tokenizer.device), use_cache=True
+            ).past_key_values
+        if hasattr(past_key_values, "to_legacy_cache"):
+            past_key_values = past_key_values.to_legacy_cache()
+        prefix_cache[key] = (prefix_ids, past_key_values)
+    return prefix_cache[key]
+
+class PaddingAwareRepetitionPenalty(LogitsProcessor):
+    """Repetition penalty that ignores the left padding of batched prompts"""
+    
+    def __init__(self, penalty: float, prompt_mask: torch.Tensor):
+        self.penalty = penalty
+        self.prompt_mask = prompt_mask.bool()
+    
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        # Swap padded positions for each row's latest token, which is penalized anyway
+        width = self.prompt_mask.shape[1]
+        token_ids = input_ids.clone()
+        token_ids[:, :width] = torch.where(self.prompt_mask, input_ids[:, :width], input_ids[:, -1:])
+        
+        score = torch.gather(scores, 1, token_ids)
+        score = torch.where(score < 0, score * self.penalty, score / self.penalty)
+        return scores.scatter(1, token_ids, score)
+
+@torch.inference_mode()
+def generate_batch(items: List[Tuple[str, str, str]]) -> List[bytes]:
+    """Generate WAV bytes for (text, language, voice) requests in one model.generate call (blocking)"""
+    tokenizer = audio_tokenizer.tokenizer
+    pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+    
+    prompts = [encode_prompt(text, language, voice) for text, language, voice in items]
+    
+    # Reuse the cached prefix when the whole batch shares one language and voice
+    prefix_len = 0
+    past_key_values = None
+    speakers = {(language, voice) for _, language, voice in items}
+    if settings.PREFIX_CACHE and len(speakers) == 1:
+        prefix_ids, prefix_past = get_prompt_prefix(*speakers.pop())
+        if all(ids[:len(prefix_ids)] == prefix_ids for ids in prompts):
+            prefix_len = len(prefix_ids)
+            past_key_values = tuple(
+                tuple(t.expand(len(prompts), *t.shape[1:]).contiguous() for t in layer)
+                for layer in prefix_past
+            )
+    
+    # Pad after the shared prefix so every prompt ends where generation starts
+    width = max(len(ids) for ids in prompts)
+    input_ids = torch.full((len(prompts), width), pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(prompts), width), dtype=torch.long)
+    for row, ids in enumerate(prompts):
+        start = width - len(ids) + prefix_len
+        input_ids[row, :prefix_len] = torch.tensor(ids[:prefix_len], dtype=torch.long)
+        input_ids[row, start:] = torch.tensor(ids[prefix_len:], dtype=torch.long)
+        attention_mask[row, :prefix_len] = 1
+        attention_mask[row, start:] = 1
+    
+    # Each prompt gets the budget it would have alone; the shortest needs the most,
+    # and longer prompts' outputs are trimmed to their own budget after generating
+    budgets = [max(settings.MAX_LENGTH - len(ids), 1) for ids in prompts]
+    
+    # pad_token_id may be EOS, so the penalty must not count padding as generated text
+    logits_processor = LogitsProcessorList([
+        PaddingAwareRepetitionPenalty(settings.REPETITION_PENALTY, attention_mask.to(audio_tokenizer.device))
+    ])
+    
+    device = audio_tokenizer.device
+    with inference_context():
+        output = model.generate(
+            input_ids=input_ids.to(device),
+            attention_mask=attention_mask.to(device),
+            past_key_values=past_key_values,
+            use_cache=True,
+            num_beams=1,
+            do_sample=True,
+            temperature=settings.TEMPERATURE,
+            logits_processor=logits_processor,
+            max_new_tokens=max(budgets),
+            pad_token_id=pad_token_id,
+        )
+    
+    results = []
+    for row, budget in zip(output, budgets):
+        codes = audio_tokenizer.extract_integers(tokenizer.decode(row[width:width + budget]))
+        results.append(encode_wav(audio_tokenizer.get_audio(codes)))
+    return results
+
+# Batches concurrent TTS requests into single model.generate calls
+tts_batcher = GenerationBatcher(
+    generate_batch,
+    max_batch_size=settings.BATCH_MAX_SIZE,
+    max_wait_ms=settings.BATCH_MAX_WAIT_MS
+)
+
 @app.on_event("startup")
 async def startup_event():
     """Load models when the app starts"""
+    logging.basicConfig(level=settings.LOG_LEVEL)
     success = await load_models()
     if TESTING_MODE:
         print(f"🚀 Starting {settings.API_NAME} in TESTING mode")
@@ -172,6 +418,11 @@ async def startup_event():
         if not success:
             print("⚠️  Models failed to load, but server will continue running")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work when the app shuts down"""
+    await tts_batcher.stop()
+
 @app.get("/", response_model=APIInfoResponse)
 async def root():
     """API health check and info"""
@@ -193,7 +444,7 @@ async def health_check():
     return HealthResponse(
         status="healthy",
         model_loaded=model is not None or TESTING_MODE,
-        timestamp=datetime.now().isoformat(),
+        timestamp=format_timestamp(),
         version=settings.API_VERSION,
         uptime=system_info.get("uptime"),
         testing_mode=TESTING_MODE
@@ -202,19 +453,15 @@ async def health_check():
 @app.get("/voices", response_model=VoicesResponse)
 async def get_voices():
     """Get available voices"""
-    return VoicesResponse(
-        female=settings.AVAILABLE_VOICES["female"],
-        male=settings.AVAILABLE_VOICES["male"]
-    )
+    return Response(content=VOICES_JSON, media_type="application/json")
 
 @app.get("/languages", response_model=LanguagesResponse)
 async def get_languages():
     """Get available languages"""
-    return LanguagesResponse(languages=settings.AVAILABLE_LANGUAGES)
+    return Response(content=LANGUAGES_JSON, media_type="application/json")
 
-@app.post("/generate-audio", response_model=TTSResponse)
-async def generate_audio(request: TTSRequest, background_tasks: BackgroundTasks):
-    """Convert text to Nigerian-accented speech"""
+def validate_tts_request(request: TTSRequest):
+    """Raise an HTTPException if the request cannot be synthesized"""
     
     # Validate text input using utils
     is_valid, error_msg = validate_text_input(request.text, settings.MAX_TEXT_LENGTH)
@@ -222,16 +469,16 @@ async def generate_audio(request: TTSRequest, background_tasks: BackgroundTasks)
         raise HTTPException(status_code=400, detail=error_msg)
     
     # Validate language and voice
-    if request.language not in settings.AVAILABLE_LANGUAGES:
+    if request.language not in settings.VALID_LANGUAGES:
         raise HTTPException(
             status_code=400, 
             detail=f"Language must be one of {settings.AVAILABLE_LANGUAGES}"
         )
     
-    if request.voice not in settings.all_voices:
+    if request.voice not in settings.VALID_VOICES:
         raise HTTPException(
             status_code=400, 
-            detail=f"Voice must be one of {settings.all_voices}"
+            detail=f"Voice must be one of {list(settings.all_voices)}"
         )
     
     # Check if models are loaded (unless in testing mode)
@@ -240,50 +487,57 @@ async def generate_audio(request: TTSRequest, background_tasks: BackgroundTasks)
             status_code=503, 
             detail="Models not loaded. Please wait for initialization."
         )
+
+async def synthesize(request: TTSRequest) -> bytes:
+    """Return WAV bytes for a validated request"""
+    if TESTING_MODE:
+        # Create mock audio for testing
+        print(f"📝 Generated mock audio for: {request.text[:50]}...")
+        return create_mock_audio()
+    
+    if settings.AUDIO_CACHE:
+        cache_path, hit = audio_manager.get_or_create(
+            audio_cache_key(request.text, request.language, request.voice)
+        )
+        if hit:
+            audio_bytes = await asyncio.to_thread(read_audio_file, cache_path)
+            if audio_bytes is not None:
+                return audio_bytes
+    
+    # Real TTS generation, batched with concurrent requests off the event loop
+    audio_bytes = await tts_batcher.submit((request.text, request.language, request.voice))
+    
+    if settings.AUDIO_CACHE and await asyncio.to_thread(audio_manager.store_cached, cache_path, audio_bytes):
+        audio_manager.remember_cached(cache_path)
+    return audio_bytes
+
+@app.post("/generate-audio", response_model=TTSResponse)
+@app.post("/generate-tts", response_model=TTSResponse)  # Alternative endpoint name
+@app.post("/tts", response_model=TTSResponse)  # For backward compatibility
+async def generate_audio(request: TTSRequest):
+    """Convert text to Nigerian-accented speech"""
+    
+    validate_tts_request(request)
     
     # Generate audio file path
     audio_id, output_path = audio_manager.create_audio_path()
     
     try:
-        if TESTING_MODE:
-            # Create mock audio for testing
-            mock_audio = create_mock_audio()
-            with open(output_path, "wb") as f:
-                f.write(mock_audio)
-            print(f"📝 Generated mock audio for: {request.text[:50]}...")
-        else:
-            # Real TTS generation
-            prompt = audio_tokenizer.create_prompt(
-                request.text, 
-                lang=request.language, 
-                speaker_name=request.voice
-            )
-            input_ids = audio_tokenizer.tokenize_prompt(prompt)
-            
-            output = model.generate(
-                input_ids=input_ids,
-                temperature=settings.TEMPERATURE,
-                repetition_penalty=settings.REPETITION_PENALTY,
-                max_length=settings.MAX_LENGTH,
-            )
-            
-            codes = audio_tokenizer.get_codes(output)
-            audio = audio_tokenizer.get_audio(codes)
-            
-            # Save audio file
-            torchaudio.save(output_path, audio, sample_rate=settings.SAMPLE_RATE)
-        
-        # Read and encode audio file
-        with open(output_path, "rb") as audio_file:
-            audio_bytes = audio_file.read()
-            audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
+        audio_bytes = await synthesize(request)
         
         # Estimate duration
-        duration = estimate_audio_duration(request.text)
+        duration = DEFAULT_DURATION_ESTIMATOR(request.text)
         
-        # Schedule cleanup
-        background_tasks.add_task(cleanup_single_file, output_path)
-        background_tasks.add_task(cleanup_old_files, audio_manager.base_dir)
+        # Write the file before responding so audio_url resolves as soon as the client has it;
+        # audio_manager deletes it once MAX_AUDIO_FILES newer files have been created
+        await asyncio.to_thread(save_audio_file, output_path, audio_bytes)
+        
+        if not request.return_base64:
+            audio_base64 = ""
+        elif TESTING_MODE:
+            audio_base64 = create_mock_audio_base64()
+        else:
+            audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
         
         return TTSResponse(
             audio_base64=audio_base64,
@@ -305,11 +559,26 @@ async def generate_audio(request: TTSRequest, background_tasks: BackgroundTasks)
             detail=f"Error generating audio: {str(e)}"
         )
 
-# ADD THE MISSING ENDPOINT - This is what you were testing!
-@app.post("/generate-tts", response_model=TTSResponse)
-async def generate_tts(request: TTSRequest, background_tasks: BackgroundTasks):
-    """Generate TTS - Alternative endpoint name"""
-    return await generate_audio(request, background_tasks)
+@app.post("/generate-audio-raw")
+async def generate_audio_raw(request: TTSRequest):
+    """Convert text to speech and return the WAV file itself instead of base64"""
+    
+    validate_tts_request(request)
+    
+    try:
+        audio_bytes = await synthesize(request)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error generating audio: {str(e)}"
+        )
+    
+    _, filename = generate_audio_filename()
+    return Response(
+        content=audio_bytes,
+        media_type="audio/wav",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @app.get("/audio/{filename}")
 async def get_audio(filename: str):
@@ -325,21 +594,6 @@ async def manual_cleanup():
     cleaned_count = audio_manager.cleanup_old()
     return {"message": f"Cleaned up {cleaned_count} old files"}
 
-def cleanup_single_file(file_path: str):
-    """Delete a specific file"""
-    try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            print(f"🗑️  Cleaned up file: {os.path.basename(file_path)}")
-    except Exception as e:
-        print(f"❌ Error cleaning up file {file_path}: {e}")
-
-# For backward compatibility - keeping the old endpoint
-@app.post("/tts", response_model=TTSResponse)
-async def text_to_speech(request: TTSRequest, background_tasks: BackgroundTasks):
-    """Backward compatibility endpoint"""
-    return await generate_audio(request, background_tasks)
-
 if __name__ == "__main__":
     import uvicorn
     print(f"🚀 Starting {settings.API_NAME} on {settings.HOST}:{settings.PORT}")
@@ -5,18 +5,27 @@ Test script for the Nigerian TTS API
 
 import requests
 import json
-import base64
 import wave
 import os
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 API_BASE_URL = "https://naija-tts.onrender.com"
 
+# requests.Session isn't thread-safe, so each thread keeps its own pooled session
+_local = threading.local()
+
+def get_session():
+    """Return this thread's session, creating it on first use"""
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
 def test_health_check():
     """Test the health check endpoint"""
     print("Testing health check...")
     try:
-        response = requests.get(f"{API_BASE_URL}/health")
+        response = get_session().get(f"{API_BASE_URL}/health")
         print(f"Status: {response.status_code}")
         print(f"Response: {response.json()}")
         return response.status_code == 200
@@ -28,7 +37,7 @@ def test_root_endpoint():
     """Test the root endpoint"""
     print("\nTesting root endpoint...")
     try:
-        response = requests.get(f"{API_BASE_URL}/")
+        response = get_session().get(f"{API_BASE_URL}/")
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
             data = response.json()
@@ -50,24 +59,22 @@ def test_tts_generation():
     }
     
     try:
-        response = requests.post(f"{API_BASE_URL}/tts", json=payload)
+        # The raw endpoint returns the WAV itself, avoiding base64 on both ends
+        response = get_session().post(f"{API_BASE_URL}/generate-audio-raw", json=payload)
         print(f"Status: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Generated audio for: {data['text']}")
-            print(f"✅ Voice: {data['voice']}, Language: {data['language']}")
+            print(f"✅ Generated audio for: {payload['text']}")
+            print(f"✅ Voice: {payload['voice']}, Language: {payload['language']}")
             
             # Save audio file for testing
-            if 'audio_base64' in data:
-                audio_data = base64.b64decode(data['audio_base64'])
-                with open("test_output.wav", "wb") as f:
-                    f.write(audio_data)
-                print("✅ Audio saved as test_output.wav")
-                
-                # Check file size
-                file_size = os.path.getsize("test_output.wav")
-                print(f"✅ Audio file size: {file_size} bytes")
+            with open("test_output.wav", "wb") as f:
+                f.write(response.content)
+            print("✅ Audio saved as test_output.wav")
+            
+            # Check file size
+            file_size = os.path.getsize("test_output.wav")
+            print(f"✅ Audio file size: {file_size} bytes")
             
             return True
         else:
@@ -83,7 +90,7 @@ def test_all_voices():
     
     # First get available voices
     try:
-        response = requests.get(f"{API_BASE_URL}/")
+        response = get_session().get(f"{API_BASE_URL}/")
         if response.status_code == 200:
             data = response.json()
             voices = data.get('available_voices', {})
@@ -99,24 +106,27 @@ def test_all_voices():
     except:
         all_voices = ["idera", "zainab", "jude", "tayo"]
     
-    for voice in all_voices:
+    def generate(voice):
         payload = {
             "text": f"This is {voice} speaking from Nigeria.",
             "language": "english",
             "voice": voice
         }
-        
+        return get_session().post(f"{API_BASE_URL}/tts", json=payload, timeout=30)
+    
+    # Send the requests concurrently, which also exercises server-side batching
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(generate, voice) for voice in all_voices]
+    
+    for voice, future in zip(all_voices, futures):
         try:
-            response = requests.post(f"{API_BASE_URL}/tts", json=payload)
+            response = future.result()
             if response.status_code == 200:
                 print(f"✅ {voice}: SUCCESS")
             else:
                 print(f"❌ {voice}: FAILED ({response.status_code})")
         except Exception as e:
             print(f"❌ {voice}: ERROR - {e}")
-        
-        # Small delay between requests
-        time.sleep(0.5)
 
 def test_error_cases():
     """Test error handling"""
@@ -128,7 +138,7 @@ def test_error_cases():
         "language": "invalid_language",
         "voice": "idera"
     }
-    response = requests.post(f"{API_BASE_URL}/tts", json=payload)
+    response = get_session().post(f"{API_BASE_URL}/tts", json=payload)
     print(f"Invalid language test: {response.status_code} (should be 400)")
     
     # Test invalid voice
@@ -137,7 +147,7 @@ def test_error_cases():
         "language": "english",
         "voice": "invalid_voice"
     }
-    response = requests.post(f"{API_BASE_URL}/tts", json=payload)
+    response = get_session().post(f"{API_BASE_URL}/tts", json=payload)
     print(f"Invalid voice test: {response.status_code} (should be 400)")
     
     # Test empty text
@@ -146,7 +156,7 @@ def test_error_cases():
         "language": "english",
         "voice": "idera"
     }
-    response = requests.post(f"{API_BASE_URL}/tts", json=payload)
+    response = get_session().post(f"{API_BASE_URL}/tts", json=payload)
     print(f"Empty text test: {response.status_code} (should be 400)")
 
 def cleanup_test_files():
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.batching import GenerationBatcher
+
+class TestGenerationBatcher:
+    """Test dynamic batching of generation requests"""
+    
+    def test_concurrent_requests_share_a_batch(self):
+        """Test that requests arriving together are processed in one batch"""
+        batches = []
+        
+        def process_batch(items):
+            batches.append(list(items))
+            return [item * 2 for item in items]
+        
+        async def run():
+            batcher = GenerationBatcher(process_batch, max_batch_size=8, max_wait_ms=20)
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+            await batcher.stop()
+            return results
+        
+        results = asyncio.run(run())
+        assert results == [0, 2, 4, 6, 8]
+        assert batches == [[0, 1, 2, 3, 4]]
+    
+    def test_batch_size_limit(self):
+        """Test that batches never exceed max_batch_size"""
+        batches = []
+        
+        def process_batch(items):
+            batches.append(list(items))
+            return items
+        
+        async def run():
+            batcher = GenerationBatcher(process_batch, max_batch_size=2, max_wait_ms=20)
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+            await batcher.stop()
+            return results
+        
+        assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+        assert all(len(batch) <= 2 for batch in batches)
+    
+    def test_errors_reach_every_request(self):
+        """Test that a failing batch raises in each waiting request"""
+        def process_batch(items):
+            raise RuntimeError("generation failed")
+        
+        async def run():
+            batcher = GenerationBatcher(process_batch, max_wait_ms=20)
+            results = await asyncio.gather(
+                batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+            )
+            await batcher.stop()
+            return results
+        
+        for result in asyncio.run(run()):
+            assert isinstance(result, RuntimeError)
@@ -51,6 +51,24 @@ class TestAPI:
         assert data["status"] in ["healthy", "ok"]
         assert isinstance(data["model_loaded"], bool)
 
+    def test_voices_endpoint(self):
+        """Test the voices endpoint returns voices by gender"""
+        response = client.get("/voices")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        
+        data = response.json()
+        assert "idera" in data["female"]
+        assert "jude" in data["male"]
+
+    def test_languages_endpoint(self):
+        """Test the languages endpoint returns supported languages"""
+        response = client.get("/languages")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "english" in data["languages"]
+
     def test_tts_valid_request(self):
         """Test TTS with valid request"""
         payload = {
@@ -79,6 +97,83 @@ class TestAPI:
             # Some other error - should not happen with valid request
             pytest.fail(f"Unexpected status code: {response.status_code}")
 
+    def test_tts_audio_url_available(self):
+        """Test that the audio URL of a base64 response can be fetched"""
+        payload = {
+            "text": "Hello, this is a test.",
+            "language": "english",
+            "voice": "idera"
+        }
+        
+        response = client.post("/tts", json=payload)
+        
+        if response.status_code == 200:
+            data = response.json()
+            assert data["audio_base64"]
+            assert client.get(data["audio_url"]).status_code == 200
+        elif response.status_code == 503:
+            # Model not loaded - acceptable in test environment
+            assert "detail" in response.json()
+        else:
+            pytest.fail(f"Unexpected status code: {response.status_code}")
+    
+    def test_audio_url_written_before_response(self, monkeypatch):
+        """Test that audio_url resolves without running any background tasks"""
+        import asyncio
+        import main
+        from app.models import TTSRequest
+        
+        # Call the handler directly so Starlette never runs background tasks
+        monkeypatch.setattr(main, "TESTING_MODE", True)
+        request = TTSRequest(text="Hello, this is a test.", language="english", voice="idera")
+        result = asyncio.run(main.generate_audio(request))
+        
+        assert client.get(result.audio_url).status_code == 200
+    
+    def test_tts_without_base64(self):
+        """Test TTS that returns only the audio URL"""
+        payload = {
+            "text": "Hello, this is a test.",
+            "language": "english",
+            "voice": "idera",
+            "return_base64": False
+        }
+        
+        response = client.post("/tts", json=payload)
+        
+        if response.status_code == 200:
+            data = response.json()
+            assert data["audio_base64"] == ""
+            
+            # The file must be available without the base64 copy
+            audio_response = client.get(data["audio_url"])
+            assert audio_response.status_code == 200
+        elif response.status_code == 503:
+            # Model not loaded - acceptable in test environment
+            assert "detail" in response.json()
+        else:
+            pytest.fail(f"Unexpected status code: {response.status_code}")
+
+    def test_generate_audio_raw(self):
+        """Test TTS that returns the WAV bytes directly"""
+        payload = {
+            "text": "Hello, this is a test.",
+            "language": "english",
+            "voice": "idera"
+        }
+        
+        response = client.post("/generate-audio-raw", json=payload)
+        
+        if response.status_code == 200:
+            assert response.headers["content-type"] == "audio/wav"
+            assert "attachment" in response.headers["content-disposition"]
+            assert response.content[:4] == b"RIFF"
+        elif response.status_code == 503:
+            # Model not loaded - acceptable in test environment
+            assert "detail" in response.json()
+        else:
+            pytest.fail(f"Unexpected status code: {response.status_code}")
+    
     def test_tts_invalid_language(self):
         """Test TTS with invalid language"""
         payload = {
@@ -215,4 +310,54 @@ class TestValidation:
             
             response = client.post("/tts", json=payload)
             # Should not fail due to voice validation
-            assert response.status_code != 400 or "Invalid voice" not in response.json().get("detail", "")
\ No newline at end of file
+            assert response.status_code != 400 or "Invalid voice" not in response.json().get("detail", "")
+class TestBatchGeneration:
+    """Test batched generation with stub model and tokenizer"""
+    
+    def _setup_stubs(self, monkeypatch):
+        """Replace the model and tokenizer with stubs that never emit EOS"""
+        import torch
+        import main
+        
+        class StubTokenizer:
+            pad_token_id = None
+            eos_token_id = 0
+            
+            def decode(self, ids):
+                return ",".join(str(int(i)) for i in ids)
+        
+        class StubAudioTokenizer:
+            tokenizer = StubTokenizer()
+            device = torch.device("cpu")
+            
+            def extract_integers(self, text):
+                return [int(i) for i in text.split(",") if i]
+            
+            def get_audio(self, codes):
+                return codes
+        
+        class StubModel:
+            def generate(self, input_ids, max_new_tokens, **kwargs):
+                new_tokens = torch.ones((input_ids.shape[0], max_new_tokens), dtype=torch.long)
+                return torch.cat([input_ids, new_tokens], dim=1)
+        
+        # Prompt length is set by the text length
+        monkeypatch.setattr(main, "audio_tokenizer", StubAudioTokenizer())
+        monkeypatch.setattr(main, "model", StubModel())
+        monkeypatch.setattr(main, "encode_prompt", lambda text, language, voice: tuple(range(1, len(text) + 1)))
+        monkeypatch.setattr(main, "encode_wav", lambda audio: audio)
+        monkeypatch.setattr(main.settings, "PREFIX_CACHE", False)
+        monkeypatch.setattr(main.settings, "MAX_LENGTH", 50)
+        return main
+    
+    def test_short_prompt_keeps_its_budget_in_a_batch(self, monkeypatch):
+        """Test that a short prompt batched with a long one gets the same token budget as alone"""
+        main = self._setup_stubs(monkeypatch)
+        short = ("hi", "english", "idera")
+        long = ("a much longer prompt text", "english", "idera")
+        
+        alone = main.generate_batch([short])[0]
+        batched = main.generate_batch([long, short])
+        
+        assert len(batched[1]) == len(alone) == 48
+        assert len(batched[0]) == 50 - len(long[0])
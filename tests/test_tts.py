@@ -1,221 +1,299 @@
 import pytest
 import sys
 import os
-from unittest.mock import Mock, patch
+import time
+from types import SimpleNamespace
 
 # Add the parent directory to the path so we can import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.utils import validate_text_length, estimate_audio_duration, cleanup_old_files
-from app.config import settings
+from app.utils import validate_text_length, estimate_audio_duration, estimate_audio_duration_batch, make_duration_estimator, cleanup_old_files, AudioFileManager, audio_cache_key
+from app import config
+from app.config import settings, file_exists
 
-class TestTTSUtils:
-    """Test utility functions for TTS"""
+# Test utility functions for TTS
+
+@pytest.mark.parametrize("text,expected", [
+    # Valid text
+    ("Hello world", True),
+    ("A" * 500, True),
+    ("A" * 1000, True),
+    # Invalid text - too long
+    ("A" * 1001, False),
+    # Invalid text - empty
+    ("", False),
+    ("   ", False),
+    # Edge cases
+    ("A", True),
+    (" A ", True),
+])
+def test_validate_text_length(text, expected):
+    """Test text length validation"""
+    assert validate_text_length(text) is expected
+
+def test_estimate_audio_duration():
+    """Test audio duration estimation"""
+    # Empty text
+    duration = estimate_audio_duration("")
+    assert duration == 0.0
     
-    def test_validate_text_length(self):
-        """Test text length validation"""
-        # Valid text
-        assert validate_text_length("Hello world") == True
-        assert validate_text_length("A" * 500) == True
-        assert validate_text_length("A" * 1000) == True
-        
-        # Invalid text - too long
-        assert validate_text_length("A" * 1001) == False
-        
-        # Invalid text - empty
-        assert validate_text_length("") == False
-        assert validate_text_length("   ") == False
-        
-        # Edge cases
-        assert validate_text_length("A") == True
-        assert validate_text_length(" A ") == True
-
-    def test_estimate_audio_duration(self):
-        """Test audio duration estimation"""
-        # Empty text
-        duration = estimate_audio_duration("")
-        assert duration == 0.0
-        
-        # Single word
-        duration = estimate_audio_duration("Hello")
-        assert duration > 0
-        assert duration < 1  # Should be less than 1 second
-        
-        # Normal sentence
-        text = "Hello world, this is a test of the audio duration estimation."
-        duration = estimate_audio_duration(text)
-        assert duration > 0
-        assert duration < 10  # Should be reasonable duration
-        
-        # Long text
-        long_text = "word " * 150  # 150 words
-        duration = estimate_audio_duration(long_text)
-        assert duration >= 60  # Should be about 1 minute at 150 WPM
-        
-        # Custom WPM
-        duration_slow = estimate_audio_duration("word " * 100, words_per_minute=100)
-        duration_fast = estimate_audio_duration("word " * 100, words_per_minute=200)
-        assert duration_slow > duration_fast
-
-    @patch('os.path.exists')
-    @patch('os.listdir')
-    @patch('os.path.getmtime')
-    @patch('os.remove')
-    def test_cleanup_old_files(self, mock_remove, mock_getmtime, mock_listdir, mock_exists):
-        """Test cleanup of old audio files"""
-        # Mock directory exists
-        mock_exists.return_value = True
-        
-        # Mock files in directory
-        mock_listdir.return_value = [
-            'old_file.wav',
-            'new_file.wav', 
-            'other_file.txt',  # Should be ignored
-            'old_file.mp3',
-            'new_file.mp3'
-        ]
-        
-        # Mock file modification times
-        import time
-        current_time = time.time()
-        old_time = current_time - (2 * 3600)  # 2 hours ago
-        new_time = current_time - (0.5 * 3600)  # 30 minutes ago
-        
-        def mock_getmtime_side_effect(path):
-            if 'old_file' in path:
-                return old_time
-            else:
-                return new_time
-        
-        mock_getmtime.side_effect = mock_getmtime_side_effect
-        
-        # Test cleanup with 1 hour max age
-        deleted_count = cleanup_old_files("/fake/directory", max_age_hours=1)
-        
-        # Should delete 2 old files (old_file.wav and old_file.mp3)
-        assert deleted_count == 2
-        assert mock_remove.call_count == 2
-
-    def test_cleanup_nonexistent_directory(self):
-        """Test cleanup when directory doesn't exist"""
-        deleted_count = cleanup_old_files("/nonexistent/directory")
-        assert deleted_count == 0
-
-class TestTTSConfig:
-    """Test TTS configuration"""
-    
-    def test_settings_exist(self):
-        """Test that all required settings exist"""
-        assert hasattr(settings, 'TOKENIZER_PATH')
-        assert hasattr(settings, 'WAV_TOKENIZER_CONFIG_PATH')
-        assert hasattr(settings, 'WAV_TOKENIZER_MODEL_PATH')
-        assert hasattr(settings, 'PORT')
-        assert hasattr(settings, 'HOST')
-        assert hasattr(settings, 'SAMPLE_RATE')
-        assert hasattr(settings, 'AVAILABLE_VOICES')
-        assert hasattr(settings, 'AVAILABLE_LANGUAGES')
-
-    def test_available_voices_structure(self):
-        """Test that available voices have correct structure"""
-        voices = settings.AVAILABLE_VOICES
-        
-        assert isinstance(voices, dict)
-        assert 'female' in voices
-        assert 'male' in voices
-        assert isinstance(voices['female'], list)
-        assert isinstance(voices['male'], list)
-        
-        # Check that we have some voices
-        assert len(voices['female']) > 0
-        assert len(voices['male']) > 0
-        
-        # Check that voices are strings
-        for voice in voices['female']:
-            assert isinstance(voice, str)
-            assert len(voice) > 0
-        
-        for voice in voices['male']:
-            assert isinstance(voice, str)
-            assert len(voice) > 0
+    # Single word
+    duration = estimate_audio_duration("Hello")
+    assert duration > 0
+    assert duration < 1  # Should be less than 1 second
+    
+    # Normal sentence
+    text = "Hello world, this is a test of the audio duration estimation."
+    duration = estimate_audio_duration(text)
+    assert duration > 0
+    assert duration < 10  # Should be reasonable duration
+    
+    # Long text
+    long_text = "word " * 150  # 150 words
+    duration = estimate_audio_duration(long_text)
+    assert duration >= 60  # Should be about 1 minute at 150 WPM
+    
+    # Custom WPM
+    duration_slow = estimate_audio_duration("word " * 100, words_per_minute=100)
+    duration_fast = estimate_audio_duration("word " * 100, words_per_minute=200)
+    assert duration_slow > duration_fast
 
-    def test_available_languages(self):
-        """Test available languages"""
-        languages = settings.AVAILABLE_LANGUAGES
-        
-        assert isinstance(languages, list)
-        assert len(languages) > 0
-        
-        # Check for expected languages
-        expected_languages = ['english', 'yoruba', 'igbo', 'hausa']
-        for lang in expected_languages:
-            assert lang in languages
-        
-        # Check that all languages are strings
-        for lang in languages:
-            assert isinstance(lang, str)
-            assert len(lang) > 0
-
-    def test_port_and_host_settings(self):
-        """Test port and host settings"""
-        assert isinstance(settings.PORT, int)
-        assert settings.PORT > 0
-        assert settings.PORT <= 65535
-        
-        assert isinstance(settings.HOST, str)
-        assert len(settings.HOST) > 0
-
-    def test_sample_rate(self):
-        """Test sample rate setting"""
-        assert isinstance(settings.SAMPLE_RATE, int)
-        assert settings.SAMPLE_RATE > 0
-        # Common sample rates
-        assert settings.SAMPLE_RATE in [8000, 16000, 22050, 24000, 44100, 48000]
-
-class TestTTSValidation:
-    """Test TTS input validation logic"""
-    
-    def test_voice_validation(self):
-        """Test voice validation against settings"""
-        valid_voices = []
-        for gender_voices in settings.AVAILABLE_VOICES.values():
-            valid_voices.extend(gender_voices)
-        
-        # Test some expected voices
-        expected_voices = ['idera', 'zainab', 'jude', 'tayo']
-        for voice in expected_voices:
-            assert voice in valid_voices, f"Voice '{voice}' should be in available voices"
-
-    def test_language_validation(self):
-        """Test language validation against settings"""
-        valid_languages = settings.AVAILABLE_LANGUAGES
-        
-        # Test expected languages
-        expected_languages = ['english', 'yoruba', 'igbo', 'hausa']
-        for lang in expected_languages:
-            assert lang in valid_languages, f"Language '{lang}' should be available"
-
-class TestModelPaths:
-    """Test model path configurations"""
-    
-    def test_model_path_format(self):
-        """Test that model paths are properly formatted"""
-        config_path = settings.WAV_TOKENIZER_CONFIG_PATH
-        model_path = settings.WAV_TOKENIZER_MODEL_PATH
-        
-        assert isinstance(config_path, str)
-        assert isinstance(model_path, str)
-        assert len(config_path) > 0
-        assert len(model_path) > 0
-        
-        # Check file extensions
-        assert config_path.endswith('.yaml') or config_path.endswith('.yml')
-        assert model_path.endswith('.ckpt') or model_path.endswith('.pt') or model_path.endswith('.pth')
+def test_make_duration_estimator():
+    """Test that a specialized estimator matches the general estimate"""
+    estimate = make_duration_estimator(100)
+    assert estimate("word " * 10) == estimate_audio_duration("word " * 10, 100)
+    assert estimate("   ") == 0.0
+
+def test_estimate_audio_duration_batch():
+    """Test that batch estimates match the scalar estimate"""
+    texts = ["", "   ", "Hello", "Hello world", "word " * 100, " ".join(["a"] * 37)]
+    durations = estimate_audio_duration_batch(texts, words_per_minute=120)
+    
+    assert len(durations) == len(texts)
+    for text, duration in zip(texts, durations):
+        assert abs(duration - estimate_audio_duration(text, words_per_minute=120)) < 1e-9
+
+def make_aged_file(directory, name, age_hours):
+    """Create an empty file whose modification time is age_hours in the past"""
+    path = directory / name
+    path.write_bytes(b"")
+    mtime = time.time() - age_hours * 3600
+    os.utime(path, (mtime, mtime))
+    return path
+
+def test_cleanup_old_files(tmp_path):
+    """Test cleanup of old audio files"""
+    # 2 hours old or 30 minutes old
+    for name, age_hours in [('old_file.wav', 2), ('new_file.wav', 0.5),
+                            ('other_file.txt', 2),  # Should be ignored
+                            ('old_file.mp3', 2), ('new_file.mp3', 0.5)]:
+        make_aged_file(tmp_path, name, age_hours)
+    
+    # Test cleanup with 1 hour max age
+    deleted_count = cleanup_old_files(str(tmp_path), max_age_hours=1)
+    
+    # Should delete 2 old files (old_file.wav and old_file.mp3)
+    assert deleted_count == 2
+    assert set(os.listdir(tmp_path)) == {'new_file.wav', 'other_file.txt', 'new_file.mp3'}
+
+def test_cleanup_nonexistent_directory():
+    """Test cleanup when directory doesn't exist"""
+    deleted_count = cleanup_old_files("/nonexistent/directory")
+    assert deleted_count == 0
+
+def test_cleanup_path_is_file(tmp_path):
+    """Test cleanup when the path is a file rather than a directory"""
+    path = make_aged_file(tmp_path, "audio.wav", 2)
+    assert cleanup_old_files(str(path)) == 0
+    assert path.exists()
+
+def test_cleanup_custom_extensions(tmp_path):
+    """Test cleanup limited to the given extensions"""
+    make_aged_file(tmp_path, "old.flac", 2)
+    make_aged_file(tmp_path, "old.wav", 2)
+    
+    assert cleanup_old_files(str(tmp_path), max_age_hours=1, extensions=('.flac',)) == 1
+    assert not (tmp_path / "old.flac").exists()
+    assert (tmp_path / "old.wav").exists()
+
+def test_cleanup_many_old_files(tmp_path):
+    """Test cleanup when enough files expire to delete them in parallel"""
+    for i in range(20):
+        make_aged_file(tmp_path, f"old_{i}.wav", 2)
+    make_aged_file(tmp_path, "new.wav", 0)
+    
+    assert cleanup_old_files(str(tmp_path), max_age_hours=1) == 20
+    assert [p.name for p in tmp_path.iterdir()] == ["new.wav"]
+
+def test_audio_manager_evicts_oldest(tmp_path):
+    """Test that the audio manager deletes the oldest files beyond its limit"""
+    manager = AudioFileManager(str(tmp_path), max_files=2)
+    
+    paths = []
+    for _ in range(3):
+        _, path = manager.create_audio_path()
+        with open(path, "wb") as f:
+            f.write(b"RIFF")
+        paths.append(path)
+    
+    assert not os.path.exists(paths[0])
+    assert os.path.exists(paths[1])
+    assert os.path.exists(paths[2])
+
+def test_audio_cache(tmp_path):
+    """Test that cached audio is found by key and bounded in size"""
+    manager = AudioFileManager(str(tmp_path), max_files=1)
+    key = audio_cache_key("Hello  world", "english", "idera")
+    assert key == audio_cache_key(" Hello world ", "english", "idera")
+    assert key != audio_cache_key("Hello world", "english", "jude")
+    
+    path, hit = manager.get_or_create(key)
+    assert not hit
+    assert manager.store_cached(path, b"RIFF")
+    manager.remember_cached(path)
+    assert manager.get_or_create(key) == (path, True)
+    
+    # Caching another key evicts the first
+    other_path, _ = manager.get_or_create(audio_cache_key("Bye", "english", "idera"))
+    manager.store_cached(other_path, b"RIFF")
+    manager.remember_cached(other_path)
+    assert not os.path.exists(path)
+    assert manager.get_or_create(key) == (path, False)
+
+# Test TTS configuration
+
+@pytest.fixture(scope="session")
+def cfg():
+    """Snapshot of the settings values as plain attributes"""
+    return SimpleNamespace(**{name: getattr(settings, name) for name in dir(settings) if name.isupper()})
+
+def test_settings_exist(cfg):
+    """Test that all required settings exist"""
+    for name in ('TOKENIZER_PATH', 'WAV_TOKENIZER_CONFIG_PATH', 'WAV_TOKENIZER_MODEL_PATH',
+                 'PORT', 'HOST', 'SAMPLE_RATE', 'AVAILABLE_VOICES', 'AVAILABLE_LANGUAGES'):
+        assert hasattr(cfg, name), f"Setting '{name}' should exist"
+
+def test_available_voices_structure(cfg):
+    """Test that available voices have correct structure"""
+    voices = cfg.AVAILABLE_VOICES
+    
+    assert isinstance(voices, dict)
+    assert 'female' in voices
+    assert 'male' in voices
+    assert isinstance(voices['female'], list)
+    assert isinstance(voices['male'], list)
+    
+    # Check that we have some voices
+    assert len(voices['female']) > 0
+    assert len(voices['male']) > 0
+    
+    # Check that voices are strings
+    for voice in voices['female']:
+        assert isinstance(voice, str)
+        assert len(voice) > 0
+    
+    for voice in voices['male']:
+        assert isinstance(voice, str)
+        assert len(voice) > 0
+
+def test_available_languages(cfg):
+    """Test available languages"""
+    languages = cfg.AVAILABLE_LANGUAGES
+    
+    assert isinstance(languages, list)
+    assert len(languages) > 0
+    
+    # Check for expected languages
+    expected_languages = ['english', 'yoruba', 'igbo', 'hausa']
+    for lang in expected_languages:
+        assert lang in languages
+    
+    # Check that all languages are strings
+    for lang in languages:
+        assert isinstance(lang, str)
+        assert len(lang) > 0
+
+def test_port_and_host_settings(cfg):
+    """Test port and host settings"""
+    assert isinstance(cfg.PORT, int)
+    assert cfg.PORT > 0
+    assert cfg.PORT <= 65535
+    
+    assert isinstance(cfg.HOST, str)
+    assert len(cfg.HOST) > 0
+
+def test_sample_rate(cfg):
+    """Test sample rate setting"""
+    assert isinstance(cfg.SAMPLE_RATE, int)
+    assert cfg.SAMPLE_RATE > 0
+    # Common sample rates
+    assert cfg.SAMPLE_RATE in [8000, 16000, 22050, 24000, 44100, 48000]
+
+# Test TTS input validation logic
+
+@pytest.fixture(scope="module")
+def valid_voices():
+    """Voice names shared by the validation tests"""
+    return settings.VALID_VOICES
+
+@pytest.fixture(scope="module")
+def valid_languages():
+    """Language names shared by the validation tests"""
+    return settings.VALID_LANGUAGES
+
+def test_voice_validation(valid_voices):
+    """Test voice validation against settings"""
+    # Test some expected voices
+    expected_voices = ['idera', 'zainab', 'jude', 'tayo']
+    for voice in expected_voices:
+        assert voice in valid_voices, f"Voice '{voice}' should be in available voices"
+
+def test_language_validation(valid_languages):
+    """Test language validation against settings"""
+    # Test expected languages
+    expected_languages = ['english', 'yoruba', 'igbo', 'hausa']
+    for lang in expected_languages:
+        assert lang in valid_languages, f"Language '{lang}' should be available"
+
+# Test model path configurations
+
+def test_model_path_format():
+    """Test that model paths are properly formatted"""
+    config_path = settings.WAV_TOKENIZER_CONFIG_PATH
+    model_path = settings.WAV_TOKENIZER_MODEL_PATH
+    
+    assert isinstance(config_path, str)
+    assert isinstance(model_path, str)
+    assert len(config_path) > 0
+    assert len(model_path) > 0
+    
+    # Check file extensions
+    config_ext = config_path.rpartition('.')[2].lower()
+    model_ext = model_path.rpartition('.')[2].lower()
+    assert config_ext in {'yaml', 'yml'}
+    assert model_ext in {'ckpt', 'pt', 'pth'}
+
+def test_tokenizer_path():
+    """Test tokenizer path configuration"""
+    tokenizer_path = settings.TOKENIZER_PATH
+    
+    assert isinstance(tokenizer_path, str)
+    assert len(tokenizer_path) > 0
+    # Should be a HuggingFace model path
+    assert "/" in tokenizer_path  # Format: username/model_name
 
-    def test_tokenizer_path(self):
-        """Test tokenizer path configuration"""
-        tokenizer_path = settings.TOKENIZER_PATH
+def test_file_exists_cache(tmp_path, monkeypatch):
+    """Test that found model paths are remembered"""
+    # Isolate the module-level caches so other tests see a clean state
+    monkeypatch.setattr(config, "_known_files", set())
+    config._file_exists.cache_clear()
+    try:
+        model_file = tmp_path / "model.ckpt"
+        model_file.write_bytes(b"")
+        assert file_exists(str(model_file)) is True
         
-        assert isinstance(tokenizer_path, str)
-        assert len(tokenizer_path) > 0
-        # Should be a HuggingFace model path
-        assert "/" in tokenizer_path  # Format: username/model_name
\ No newline at end of file
+        # Once seen, the path is not re-checked on disk
+        model_file.unlink()
+        assert file_exists(str(model_file)) is True
+    finally:
+        config._file_exists.cache_clear()